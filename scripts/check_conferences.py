@@ -1,45 +1,156 @@
 #!/usr/bin/env python3
-import json
+import hashlib
 import os
 import re
 import sys
 from datetime import datetime
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set, Tuple
+import ahocorasick
+import orjson
 import requests
-from bs4 import BeautifulSoup
-
-
-def fetch_conferences() -> List[Dict]:
-    """Fetch and parse conference data from PostgreSQL website."""
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Shared session so the page fetch and the issue POST reuse one connection
+# pool. requests already advertises gzip (and br when a decoder is installed).
+SESSION = requests.Session()
+SESSION.headers.update({'User-Agent': 'pgconf-watch/1.0'})
+SESSION.mount('https://', HTTPAdapter(max_retries=Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=[502, 503, 504]
+)))
+
+
+# Number of delta log entries kept before they are folded into the snapshot
+DELTA_LOG_LIMIT = 50
+
+# Keywords used to classify lines of the conference page, by category
+_KEYWORDS = {
+    'skip': ('navigation', 'search', 'menu', 'header'),
+    'conf': ('pgconf', 'pgday', 'postgresql conference', 'nordic pgday'),
+    'location': ('location:', 'hotel', 'city', 'country'),
+    'status': ('call for papers', 'registration', 'schedule', 'published')
+}
+_MONTH_RE = re.compile(
+    r'\b(january|february|march|april|may|june|july|august|september|october|november|december)',
+    re.I
+)
+
+# Characters dropped when deriving a conference id from its name
+_ID_RE = re.compile(r'[^\w\s-]')
+
+
+def _build_automaton() -> ahocorasick.Automaton:
+    """Build a single automaton matching every keyword, tagged with its category."""
+    automaton = ahocorasick.Automaton()
+    for category, words in _KEYWORDS.items():
+        for word in words:
+            automaton.add_word(word, category)
+    automaton.make_automaton()
+    return automaton
+
+
+_AUTOMATON = _build_automaton()
+
+
+def classify_line(low: str) -> Set[str]:
+    """Return the keyword categories found in a lowercased line, in one pass."""
+    return {category for _, category in _AUTOMATON.iter(low)}
+
+
+def read_content_text(response: requests.Response) -> str:
+    """Stream the page into lxml and return the text of its content area.
+
+    Reading stops as soon as ``#pgContentWrap`` is closed, so the footer and
+    anything after it are never downloaded or parsed.
+    """
+    # Honour a declared charset, otherwise let lxml sniff <meta charset>
+    content_type = response.headers.get('Content-Type', '').lower()
+    encoding = response.encoding if 'charset=' in content_type else None
+    parser = etree.HTMLPullParser(events=('end',), encoding=encoding)
+
+    content_area = None
+    for chunk in response.iter_content(chunk_size=8192):
+        parser.feed(chunk)
+        for _, elem in parser.read_events():
+            if elem.get('id') == 'pgContentWrap':
+                content_area = elem
+                break
+        if content_area is not None:
+            break
+    else:
+        try:
+            root = parser.close()
+        except etree.XMLSyntaxError:
+            # Empty body, there is nothing to extract
+            return ''
+        content_area = root.find('.//main')
+        if content_area is None:
+            content_area = root
+
+    # Match BeautifulSoup's get_text(), which leaves out scripts and styles
+    etree.strip_elements(content_area, 'script', 'style', with_tail=False)
+    return ''.join(content_area.itertext())
+
+
+def fetch_conferences(meta: Dict) -> Tuple[Optional[List[Dict]], Dict]:
+    """Fetch and parse conference data from PostgreSQL website.
+
+    Sends the validators stored in ``meta`` as a conditional request. Returns
+    ``(None, meta)`` when the page has not been modified since the last run,
+    otherwise the parsed conferences along with the new validators. Parsing
+    is also skipped (returning ``None``) when the content area hashes to the
+    same digest as last time.
+    """
     url = "https://www.postgresql.org/about/newsarchive/conferences/"
 
+    headers = {}
+    if meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
+        with SESSION.get(url, headers=headers, timeout=30, stream=True) as response:
+            response.raise_for_status()
+
+            if response.status_code == 304:
+                return None, meta
+
+            new_meta = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            }
+
+            # Look for conference information patterns
+            text_content = read_content_text(response)
     except requests.RequestException as e:
         print(f"Error fetching URL: {e}")
         sys.exit(1)
 
-    soup = BeautifulSoup(response.content, 'html.parser')
-    conferences = []
-
-    # Find all conference entries - they're typically in divs or sections
-    content_area = soup.find('div', {'id': 'pgContentWrap'}) or soup.find('main') or soup
+    digest = hashlib.sha256(text_content.encode('utf-8')).hexdigest()
+    new_meta['sha256'] = digest
+    if digest == meta.get('sha256'):
+        return None, new_meta
 
-    # Look for conference information patterns
-    text_content = content_area.get_text()
-    lines = [line.strip() for line in text_content.split('\n') if line.strip()]
+    conferences = []
+    lines = (stripped for line in text_content.split('\n') if (stripped := line.strip()))
 
     current_conference = {}
     in_conference_section = False
 
-    for i, line in enumerate(lines):
+    for line in lines:
+        categories = classify_line(line.lower())
+
         # Skip navigation and header content
-        if any(skip in line.lower() for skip in ['navigation', 'search', 'menu', 'header']):
+        if 'skip' in categories:
             continue
 
         # Look for conference patterns
-        if any(conf_word in line.lower() for conf_word in ['pgconf', 'pgday', 'postgresql conference', 'nordic pgday']):
+        if 'conf' in categories:
             if current_conference:
                 conferences.append(current_conference)
 
@@ -56,13 +167,13 @@ def fetch_conferences() -> List[Dict]:
             current_conference['details'].append(line)
 
             # Parse specific information
-            if re.search(r'\b(january|february|march|april|may|june|july|august|september|october|november|december)', line, re.I):
+            if _MONTH_RE.search(line):
                 current_conference['parsed_date'] = line
 
-            if any(location_word in line.lower() for location_word in ['location:', 'hotel', 'city', 'country']):
+            if 'location' in categories:
                 current_conference['location'] = line
 
-            if any(status_word in line.lower() for status_word in ['call for papers', 'registration', 'schedule', 'published']):
+            if 'status' in categories:
                 current_conference['status'] = line
 
         # End conference section on empty line or new major section
@@ -76,43 +187,159 @@ def fetch_conferences() -> List[Dict]:
     if current_conference:
         conferences.append(current_conference)
 
-    # Clean and deduplicate conferences
-    cleaned_conferences = []
-    seen_names = set()
+    # Clean and deduplicate conferences, keyed by name in first-seen order
+    cleaned_conferences = {}
 
     for conf in conferences:
-        if conf['name'] and conf['name'] not in seen_names:
+        name = conf['name']
+        if name and name not in cleaned_conferences:
             # Create a unique identifier
-            conf['id'] = re.sub(r'[^\w\s-]', '', conf['name']).strip().replace(' ', '_').lower()
-            cleaned_conferences.append(conf)
-            seen_names.add(conf['name'])
+            conf['id'] = _ID_RE.sub('', name).strip().replace(' ', '_').lower()
+            conf['_fingerprint'] = conference_fingerprint(conf)
+            cleaned_conferences[name] = conf
+
+    return list(cleaned_conferences.values()), new_meta
+
+
+def conference_fingerprint(conf: Dict) -> int:
+    """Hash the fields that count as a change to a conference."""
+    return hash((
+        conf.get('parsed_date'),
+        conf.get('location'),
+        conf.get('status'),
+        tuple(conf.get('details') or ())
+    ))
+
+
+def strip_private_fields(conf: Dict) -> Dict:
+    """Drop in-memory helper fields (leading underscore) before persisting."""
+    return {key: value for key, value in conf.items() if not key.startswith('_')}
+
+
+def write_file_atomic(path: str, payload: bytes) -> bool:
+    """Replace ``path`` with ``payload`` via a temp file, unless it already matches.
+
+    Returns whether the file was written.
+    """
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == payload:
+                return False
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return True
+
 
-    return cleaned_conferences
+def apply_delta(conferences: Dict[str, Dict], delta: Dict) -> None:
+    """Apply one delta log entry to conferences keyed by id, in place."""
+    for conf_id in delta['removed']:
+        conferences.pop(conf_id, None)
+    for conf in delta['modified'] + delta['added']:
+        conferences[conf['id']] = conf
 
 
-def load_previous_data(data_file: str) -> List[Dict]:
-    """Load previously stored conference data."""
+def load_previous_data(data_file: str, delta_file: str) -> Optional[List[Dict]]:
+    """Load previously stored conference data: the snapshot plus its delta log.
+
+    Returns ``None`` when the stored data exists but cannot be read, so the
+    caller can rebuild it instead of appending to it.
+    """
     if not os.path.exists(data_file):
         return []
 
     try:
-        with open(data_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
-        print(f"Error reading previous data: {e}")
-        return []
+        with open(data_file, 'rb') as f:
+            conferences = {conf['id']: conf for conf in orjson.loads(f.read())}
+
+        if os.path.exists(delta_file):
+            with open(delta_file, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        apply_delta(conferences, orjson.loads(line))
+    except (orjson.JSONDecodeError, IOError, KeyError, TypeError) as e:
+        print(f"Error reading previous data: {e!r}")
+        return None
+
+    return list(conferences.values())
 
 
 def save_current_data(data_file: str, conferences: List[Dict]) -> None:
     """Save current conference data."""
     try:
-        with open(data_file, 'w', encoding='utf-8') as f:
-            json.dump(conferences, f, indent=2, ensure_ascii=False)
+        payload = orjson.dumps([strip_private_fields(conf) for conf in conferences], option=orjson.OPT_INDENT_2)
+        if not write_file_atomic(data_file, payload):
+            print("💤 Stored conference data already up to date")
     except IOError as e:
         print(f"Error saving data: {e}")
         sys.exit(1)
 
 
+def save_changes(data_file: str, delta_file: str, changes: Dict, conferences: List[Dict],
+                 compact: bool = False) -> None:
+    """Append a run's changes to the delta log.
+
+    The snapshot is only rewritten (and the log cleared) when ``compact`` is
+    set, there is no snapshot yet or the log has grown past
+    ``DELTA_LOG_LIMIT`` entries.
+    """
+    try:
+        entries = 0
+        torn_tail = False
+        if os.path.exists(delta_file):
+            with open(delta_file, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        entries += 1
+                    torn_tail = not line.endswith(b'\n')
+
+        if compact or not os.path.exists(data_file) or entries >= DELTA_LOG_LIMIT:
+            print("🗜️  Compacting delta log into a new snapshot...")
+            save_current_data(data_file, conferences)
+            if os.path.exists(delta_file):
+                os.remove(delta_file)
+            return
+
+        delta = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'added': [strip_private_fields(conf) for conf in changes['added']],
+            'removed': [conf['id'] for conf in changes['removed']],
+            'modified': [strip_private_fields(change['new']) for change in changes['modified']]
+        }
+        with open(delta_file, 'ab') as f:
+            # Never glue a new record onto a partially written one
+            if torn_tail:
+                f.write(b'\n')
+            f.write(orjson.dumps(delta) + b'\n')
+    except IOError as e:
+        print(f"Error saving changes: {e}")
+        sys.exit(1)
+
+
+def load_metadata(meta_file: str) -> Dict:
+    """Load HTTP validators stored by the previous run."""
+    if not os.path.exists(meta_file):
+        return {}
+
+    try:
+        with open(meta_file, 'rb') as f:
+            return orjson.loads(f.read())
+    except (orjson.JSONDecodeError, IOError) as e:
+        print(f"Error reading metadata: {e}")
+        return {}
+
+
+def save_metadata(meta_file: str, meta: Dict) -> None:
+    """Save HTTP validators for the next run."""
+    try:
+        write_file_atomic(meta_file, orjson.dumps(meta, option=orjson.OPT_INDENT_2))
+    except IOError as e:
+        print(f"Error saving metadata: {e}")
+        sys.exit(1)
+
+
 def compare_conferences(old_data: List[Dict], new_data: List[Dict]) -> Dict:
     """Compare old and new conference data and return changes."""
     old_conferences = {conf['id']: conf for conf in old_data}
@@ -135,20 +362,19 @@ def compare_conferences(old_data: List[Dict], new_data: List[Dict]) -> Dict:
     for conf_id in old_ids - new_ids:
         changes['removed'].append(old_conferences[conf_id])
 
-    # Find modified conferences
+    # Find modified conferences by comparing fingerprints of the key fields.
+    # Data loaded from disk carries no fingerprint, so compute it on demand.
+    old_fp = {conf_id: conf.get('_fingerprint') or conference_fingerprint(conf)
+              for conf_id, conf in old_conferences.items()}
+    new_fp = {conf_id: conf.get('_fingerprint') or conference_fingerprint(conf)
+              for conf_id, conf in new_conferences.items()}
+
     for conf_id in old_ids & new_ids:
-        old_conf = old_conferences[conf_id]
-        new_conf = new_conferences[conf_id]
-
-        # Compare key fields
-        if (old_conf.get('details') != new_conf.get('details') or
-            old_conf.get('parsed_date') != new_conf.get('parsed_date') or
-            old_conf.get('location') != new_conf.get('location') or
-            old_conf.get('status') != new_conf.get('status')):
+        if old_fp[conf_id] != new_fp[conf_id]:
             changes['modified'].append({
                 'id': conf_id,
-                'old': old_conf,
-                'new': new_conf
+                'old': old_conferences[conf_id],
+                'new': new_conferences[conf_id]
             })
 
     return changes
@@ -156,46 +382,46 @@ def compare_conferences(old_data: List[Dict], new_data: List[Dict]) -> Dict:
 
 def create_issue_body(changes: Dict, all_conferences: List[Dict]) -> str:
     """Create GitHub issue body from changes."""
-    body = f"# PostgreSQL Conference Update\n\n"
+    parts = ["# PostgreSQL Conference Update\n\n"]
 
     if changes['added']:
-        body += "## 🆕 New Conferences Added\n\n"
+        parts.append("## 🆕 New Conferences Added\n\n")
         for conf in changes['added']:
-            body += f"### {conf['name']}\n"
+            parts.append(f"### {conf['name']}\n")
             for detail in conf['details'][:5]:  # Limit details
-                body += f"- {detail}\n"
-            body += "\n"
+                parts.append(f"- {detail}\n")
+            parts.append("\n")
 
     if changes['removed']:
-        body += "## ❌ Conferences Removed\n\n"
+        parts.append("## ❌ Conferences Removed\n\n")
         for conf in changes['removed']:
-            body += f"- **{conf['name']}**\n"
-        body += "\n"
+            parts.append(f"- **{conf['name']}**\n")
+        parts.append("\n")
 
     if changes['modified']:
-        body += "## 📝 Conference Updates\n\n"
+        parts.append("## 📝 Conference Updates\n\n")
         for change in changes['modified']:
-            body += f"### {change['new']['name']}\n"
-            body += "**Changes detected in conference details**\n\n"
+            parts.append(f"### {change['new']['name']}\n")
+            parts.append("**Changes detected in conference details**\n\n")
 
     # Add section showing all current conferences
-    body += "## 📋 All Current Conferences\n\n"
-    body += f"*Total conferences tracked: {len(all_conferences)}*\n\n"
+    parts.append("## 📋 All Current Conferences\n\n")
+    parts.append(f"*Total conferences tracked: {len(all_conferences)}*\n\n")
 
     # List all conferences in original order without grouping
     for conf in all_conferences:
-        body += f"- **{conf['name']}**\n"
+        parts.append(f"- **{conf['name']}**\n")
         # Add key details if available
         if conf.get('details') and len(conf['details']) > 0:
             for detail in conf['details'][:2]:  # Show first 2 details
                 if detail and detail != "Read more...":
-                    body += f"  - {detail}\n"
-        body += "\n"
+                    parts.append(f"  - {detail}\n")
+        parts.append("\n")
 
-    body += f"\n---\n*This issue was automatically created by the conference monitoring system.*"
-    body += f"\n*Check the [source page](https://www.postgresql.org/about/newsarchive/conferences/) for full details.*"
+    parts.append("\n---\n*This issue was automatically created by the conference monitoring system.*")
+    parts.append("\n*Check the [source page](https://www.postgresql.org/about/newsarchive/conferences/) for full details.*")
 
-    return body
+    return ''.join(parts)
 
 
 def create_github_issue(title: str, body: str) -> None:
@@ -221,7 +447,7 @@ def create_github_issue(title: str, body: str) -> None:
     }
 
     try:
-        response = requests.post(url, headers=headers, json=data, timeout=30)
+        response = SESSION.post(url, headers=headers, json=data, timeout=30)
         response.raise_for_status()
         issue_data = response.json()
         print(f"✅ Created issue #{issue_data['number']}: {title}")
@@ -234,14 +460,31 @@ def create_github_issue(title: str, body: str) -> None:
 
 def main():
     """Main function to check conferences and create issues if needed."""
-    data_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'conferences.json')
+    data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
+    data_file = os.path.join(data_dir, 'conferences.json')
+    delta_file = os.path.join(data_dir, 'conferences.delta.jsonl')
+    meta_file = os.path.join(data_dir, 'conferences.meta.json')
+
+    # Validators are only trustworthy if the data they describe is still there
+    previous_meta = load_metadata(meta_file) if os.path.exists(data_file) else {}
 
     print("🔍 Fetching current conference data...")
-    current_conferences = fetch_conferences()
+    current_conferences, meta = fetch_conferences(previous_meta)
+    if current_conferences is None:
+        print("✅ Source page not modified since last run")
+        if meta != previous_meta:
+            # Same content under new validators, keep them for the next run
+            save_metadata(meta_file, meta)
+        print("🎉 Conference monitoring complete!")
+        return
     print(f"📊 Found {len(current_conferences)} conferences")
 
     print("📂 Loading previous conference data...")
-    previous_conferences = load_previous_data(data_file)
+    previous_conferences = load_previous_data(data_file, delta_file)
+    # Unreadable stored data gets rebuilt from this run rather than appended to
+    rebuild_data = previous_conferences is None
+    if rebuild_data:
+        previous_conferences = []
     print(f"📊 Previous data contained {len(previous_conferences)} conferences")
 
     print("🔄 Comparing conference data...")
@@ -267,8 +510,11 @@ def main():
     else:
         print("✅ No changes detected")
 
-    print("💾 Saving current conference data...")
-    save_current_data(data_file, current_conferences)
+    if total_changes > 0 or rebuild_data:
+        print("💾 Saving conference changes...")
+        save_changes(data_file, delta_file, changes, current_conferences, compact=rebuild_data)
+
+    save_metadata(meta_file, meta)
 
     print("🎉 Conference monitoring complete!")
 